@@ -1,59 +1,60 @@
-import csv
-import math
-import random
+import numpy as np
+
+# One generator for every sample, drawing whole columns per call
+rng = np.random.default_rng()
+
+
+def write_csv(filename, header, fmt, data):
+    # Format every row up front and hand the file a single write
+    line_fmt = ",".join(fmt)
+    rows = [line_fmt % row for row in map(tuple, data.tolist())]
+    with open(filename, "w", buffering=1 << 20, newline="") as f:
+        f.write(header + "\n" + "\n".join(rows) + "\n")
 
 
 def generate_sample_1():
     # 4 series, 100 points, starting at T=0
     filename = "sample_1.csv"
-    with open(filename, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Time", "Sine", "Cosine", "Random_Walk", "Exp_Decay"])
-
-        rw = 0
-        for i in range(100):
-            t = i * 0.1
-            rw += random.gauss(0, 0.1)
-            writer.writerow(
-                [
-                    f"{t:.2f}",
-                    f"{math.sin(t):.4f}",
-                    f"{math.cos(t):.4f}",
-                    f"{rw:.4f}",
-                    f"{math.exp(-t / 5):.4f}",
-                ]
-            )
+    t = np.arange(100) * 0.1
+    data = np.column_stack(
+        [
+            t,
+            np.sin(t),
+            np.cos(t),
+            np.cumsum(rng.normal(0, 0.1, t.size)),
+            np.exp(-t / 5),
+        ]
+    )
+    write_csv(
+        filename,
+        "Time,Sine,Cosine,Random_Walk,Exp_Decay",
+        ["%.2f", "%.4f", "%.4f", "%.4f", "%.4f"],
+        data,
+    )
     print(f"Generated {filename}")
 
 
 def generate_sample_2():
     # 6 series, 150 points, starting at T=5 (overlapping with sample 1)
     filename = "sample_2.csv"
-    with open(filename, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            ["Time", "Square", "Sawtooth", "Noise", "Linear", "Parabolic", "Inverse"]
-        )
-
-        for i in range(150):
-            t = 5 + i * 0.1
-            square = 1 if math.sin(t) >= 0 else -1
-            sawtooth = 2 * (t / 2 - math.floor(0.5 + t / 2))
-            noise = random.gauss(0, 0.2)
-            linear = 0.1 * t
-            parabolic = 0.01 * t**2
-            inverse = 1 / (t + 1)
-            writer.writerow(
-                [
-                    f"{t:.2f}",
-                    f"{square:.4f}",
-                    f"{sawtooth:.4f}",
-                    f"{noise:.4f}",
-                    f"{linear:.4f}",
-                    f"{parabolic:.4f}",
-                    f"{inverse:.4f}",
-                ]
-            )
+    t = 5 + np.arange(150) * 0.1
+    data = np.column_stack(
+        [
+            t,
+            np.where(np.sin(t) >= 0, 1.0, -1.0),
+            2 * (t / 2 - np.floor(0.5 + t / 2)),
+            rng.normal(0, 0.2, t.size),
+            0.1 * t,
+            0.01 * t**2,
+            1 / (t + 1),
+        ]
+    )
+    write_csv(
+        filename,
+        "Time,Square,Sawtooth,Noise,Linear,Parabolic,Inverse",
+        ["%.2f"] + ["%.4f"] * 6,
+        data,
+    )
     print(f"Generated {filename}")
 
 
@@ -1,7 +1,9 @@
 import datetime
 import os
 import sys
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+
+import numpy as np
 
 # Add SDK path to sys.path
 sdk_path = os.path.abspath(
@@ -10,17 +12,19 @@ sdk_path = os.path.abspath(
 if sdk_path not in sys.path:
     sys.path.append(sdk_path)
 
-import msc_api
+import protocol  # noqa: E402
+
+import msc_api  # noqa: E402
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginState:
     """Mutable plugin state."""
 
     station: msc_api.Station | None = None
     start_date: str = ""
     end_date: str = ""
-    observations: list[msc_api.DailyObservation] = field(default_factory=list)
+    observations: msc_api.DailyObservations | None = None
 
 
 state = PluginState()
@@ -38,6 +42,7 @@ def handle_initialize(args: str) -> None:
     start_date = start_default.isoformat()
     end_date = end_default.isoformat()
     discovered_stations: list[msc_api.Station] = []
+    station_by_id: dict[str, msc_api.Station] = {}
 
     while True:
         if step == 1:
@@ -139,6 +144,9 @@ def handle_initialize(args: str) -> None:
                         protocol.send_error(msg)
                         continue
 
+                    station_by_id = {
+                        s.climate_id: s for s in discovered_stations
+                    }
                     step = 2
                 except Exception as e:
                     protocol.send_error(f"Discovery search failed: {e}")
@@ -146,14 +154,7 @@ def handle_initialize(args: str) -> None:
 
             elif step == 2:
                 selected_id = res["station"]
-                stn = next(
-                    (
-                        s
-                        for s in discovered_stations
-                        if s.climate_id == selected_id
-                    ),
-                    None,
-                )
+                stn = station_by_id.get(selected_id)
                 if not stn:
                     protocol.send_error("Selection lost. Please try again.")
                     step = 1
@@ -230,35 +231,28 @@ def handle_get_series_data(series_id: str, preferred_storage: str) -> None:
         protocol.send_error("No data available")
         return
 
-    # Convert observations to X (timestamps) and Y (values)
-    values: list[float] = []
-
-    for obs in state.observations:
-        try:
-            # Parse date YYYY-MM-DD
-            dt = datetime.datetime.strptime(obs.date, "%Y-%m-%d")
-            timestamp = dt.timestamp()
-
-            val = None
-            if series_id == "mean_temp":
-                val = obs.mean_temp
-            elif series_id == "min_temp":
-                val = obs.min_temp
-            elif series_id == "max_temp":
-                val = obs.max_temp
-
-            if val is not None:
-                if preferred_storage == "interleaved":
-                    values.append(float(timestamp))
-                    values.append(float(val))
-                else:
-                    # In this simple implementation, we assume interleaved for now
-                    # as that's what we mostly use.
-                    # TODO: handle 'arrays' if requested
-                    values.append(float(timestamp))
-                    values.append(float(val))
-        except Exception:
-            continue
+    obs = state.observations
+    columns = {
+        "mean_temp": obs.mean_temp,
+        "min_temp": obs.min_temp,
+        "max_temp": obs.max_temp,
+    }
+    temps = columns.get(series_id)
+    if temps is None:
+        protocol.send_error(f"Unknown series: {series_id}")
+        return
+
+    # Convert observations to X (UTC midnight timestamps) and Y (values),
+    # dropping days without a reading for this series
+    timestamps = obs.dates.astype("datetime64[s]").astype(np.int64)
+    mask = ~np.isnan(temps)
+
+    # Only interleaved storage is produced for now, whatever
+    # preferred_storage asks for.
+    # TODO: handle 'arrays' if requested
+    values = np.empty(2 * int(mask.sum()), dtype="<f8")
+    values[0::2] = timestamps[mask]
+    values[1::2] = temps[mask]
 
     protocol.send_binary_data(values, "interleaved")
 
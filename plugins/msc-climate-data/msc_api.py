@@ -2,16 +2,47 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Any
+from pathlib import Path
+from typing import Any, TypeVar
 
+import hishel
 import httpx
-
-import ipc_helpers
+import numpy as np
+import orjson
+import protocol
 
 BASE_URL = "https://api.weather.gc.ca"
 MAX_LIMIT = 10000
 
+T = TypeVar("T")
+
+# climate-daily properties used by fetch_daily_data
+DAILY_PROPERTIES: tuple[str, ...] = (
+    "LOCAL_DATE",
+    "MEAN_TEMPERATURE",
+    "MIN_TEMPERATURE",
+    "MAX_TEMPERATURE",
+)
+
+# On-disk HTTP cache, one directory per collection so each keeps its own
+# expiry. The station inventory barely changes; daily records gain at
+# most one row per day.
+HTTP_CACHE_DIR = Path("msc_http_cache")
+CACHE_TTLS: dict[str, int] = {
+    "climate-stations": 60 * 60,
+    "climate-daily": 24 * 60 * 60,
+}
+
+# The API sends no caching headers, so store every successful GET and let
+# the storage TTL decide when it goes stale.
+_cache_controller = hishel.Controller(
+    cacheable_methods=["GET"], force_cache=True
+)
+
 PROVINCES: dict[str, str] = {
     "AB": "ALBERTA",
     "BC": "BRITISH COLUMBIA",
@@ -29,7 +60,7 @@ PROVINCES: dict[str, str] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Station:
     """A climate station from the inventory."""
 
@@ -43,62 +74,137 @@ class Station:
     longitude: float
 
 
-@dataclass
-class DailyObservation:
-    """A single daily climate observation."""
+@dataclass(slots=True)
+class DailyObservations:
+    """Daily climate observations stored column-wise.
+
+    Dates are ``datetime64[D]``; temperatures are float64 with NaN where
+    the station reported no value.
+    """
+
+    dates: np.ndarray
+    mean_temp: np.ndarray
+    min_temp: np.ndarray
+    max_temp: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
 
-    date: str
-    mean_temp: float | None
-    min_temp: float | None
-    max_temp: float | None
+# One event loop and one HTTP/2 connection pool for the life of the
+# plugin, so discovery and the follow-up fetches reuse the same TLS
+# connection instead of handshaking per call. Each collection gets its own
+# cache layer on top of the shared transport.
+_loop = asyncio.new_event_loop()
+_transport = httpx.AsyncHTTPTransport(
+    http2=True, limits=httpx.Limits(max_keepalive_connections=8)
+)
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _client(collection: str) -> httpx.AsyncClient:
+    """Return the shared client for a collection, creating it on first use."""
+    client = _clients.get(collection)
+    if client is None:
+        storage = hishel.AsyncFileStorage(
+            base_path=HTTP_CACHE_DIR / collection, ttl=CACHE_TTLS[collection]
+        )
+        client = httpx.AsyncClient(
+            transport=hishel.AsyncCacheTransport(
+                transport=_transport,
+                storage=storage,
+                controller=_cache_controller,
+            )
+        )
+        _clients[collection] = client
+    return client
+
+
+@atexit.register
+def _close() -> None:
+    # The clients only wrap _transport, which owns the connections
+    _loop.run_until_complete(_transport.aclose())
+    _loop.close()
+
+
+async def _fetch_all_pages(
+    collection: str,
+    params: dict[str, Any],
+    timeout: float,
+    parse_feature: Callable[[dict[str, Any]], T | None],
+) -> list[T]:
+    """Fetch every page of an OGC API items query, in offset order.
+
+    The first page reports numberMatched; the remaining pages are then
+    requested concurrently instead of one round trip at a time. Every
+    feature is handed to ``parse_feature``; returning None drops it.
+    """
+    url = f"{BASE_URL}/collections/{collection}/items"
+    client = _client(collection)
+
+    async def fetch_page(offset: int) -> tuple[list[T], int, int]:
+        """Return the parsed rows, numberReturned and numberMatched."""
+        page_params = {**params, "limit": MAX_LIMIT, "offset": offset}
+        resp = await client.get(url, params=page_params, timeout=timeout)
+        resp.raise_for_status()
+
+        # The cache transport has already read the whole body, so a single
+        # orjson pass is the cheapest way to decode it
+        data = orjson.loads(resp.content)
+        features = data.get("features", [])
+        rows = [row for row in map(parse_feature, features) if row is not None]
+        return rows, len(features), data.get("numberMatched", 0)
+
+    rows, returned, matched = await fetch_page(0)
+    pages = 1
+    if 0 < returned < matched:
+        # The server may cap pages below MAX_LIMIT, so step by what it
+        # actually sent
+        offsets = range(returned, matched, returned)
+        pages += len(offsets)
+        for page_rows, _, _ in await asyncio.gather(
+            *(fetch_page(o) for o in offsets)
+        ):
+            rows.extend(page_rows)
+
+    protocol.log(
+        "debug",
+        f"OGC API Request: {url} params={params} pages={pages}",
+    )
+    return rows
+
+
+def _parse_station(feature: dict[str, Any]) -> Station | None:
+    """Build a Station from an inventory feature if it has daily data."""
+    props = feature["properties"]
+    if not props.get("DLY_FIRST_DATE"):
+        return None
+    return Station(
+        climate_id=props["CLIMATE_IDENTIFIER"],
+        name=props["STATION_NAME"],
+        province=props["ENG_PROV_NAME"],
+        province_code=props["PROV_STATE_TERR_CODE"],
+        first_date=props["DLY_FIRST_DATE"],
+        last_date=props["DLY_LAST_DATE"],
+        latitude=feature["geometry"]["coordinates"][1],
+        longitude=feature["geometry"]["coordinates"][0],
+    )
 
 
 def search_stations(province_code: str | None = None) -> list[Station]:
     """Search for stations with daily data in a province (with pagination)."""
-    url = f"{BASE_URL}/collections/climate-stations/items"
-    stations: list[Station] = []
-    offset = 0
-
-    with httpx.Client(timeout=30.0) as client:
-        while True:
-            params: dict[str, Any] = {
-                "f": "json",
-                "limit": MAX_LIMIT,
-                "offset": offset,
-            }
-
-            if province_code and province_code in PROVINCES:
-                params["ENG_PROV_NAME"] = PROVINCES[province_code]
-
-            ipc_helpers.log("debug", f"OGC API Request: {url} params={params}")
-            response = client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            for feature in data.get("features", []):
-                props = feature["properties"]
-                # Only include stations that have daily data
-                if props.get("DLY_FIRST_DATE"):
-                    stations.append(
-                        Station(
-                            climate_id=props["CLIMATE_IDENTIFIER"],
-                            name=props["STATION_NAME"],
-                            province=props["ENG_PROV_NAME"],
-                            province_code=props["PROV_STATE_TERR_CODE"],
-                            first_date=props["DLY_FIRST_DATE"],
-                            last_date=props["DLY_LAST_DATE"],
-                            latitude=feature["geometry"]["coordinates"][1],
-                            longitude=feature["geometry"]["coordinates"][0],
-                        )
-                    )
-
-            # Pagination logic
-            matched = data.get("numberMatched", 0)
-            returned = data.get("numberReturned", 0)
-            offset += returned
-
-            if offset >= matched or returned == 0:
-                break
+    params: dict[str, Any] = {"f": "json"}
+    if province_code and province_code in PROVINCES:
+        params["ENG_PROV_NAME"] = PROVINCES[province_code]
+
+    stations = _loop.run_until_complete(
+        _fetch_all_pages(
+            "climate-stations",
+            params,
+            timeout=30.0,
+            parse_feature=_parse_station,
+        )
+    )
 
     # Sort by name
     stations.sort(key=lambda s: s.name)
@@ -121,94 +227,82 @@ def search_stations_bbox(
         "limit": 500,
     }
 
-    ipc_helpers.log(
-        "debug", f"Discovery OGC API Request: {url} params={params}"
+    protocol.log("debug", f"Discovery OGC API Request: {url} params={params}")
+    response = _loop.run_until_complete(
+        _client("climate-daily").get(url, params=params, timeout=30.0)
     )
-    with httpx.Client(timeout=30.0) as client:
-        response = client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-
-        for feature in data.get("features", []):
-            props = feature["properties"]
-            cid = props.get("CLIMATE_IDENTIFIER")
-            if cid and cid not in stations_map:
-                stations_map[cid] = Station(
-                    climate_id=cid,
-                    # Fallback to cid if name missing
-                    name=props.get("STATION_NAME", cid),
-                    province=props.get("ENG_PROV_NAME", ""),
-                    province_code=props.get("PROV_STATE_TERR_CODE", ""),
-                    first_date=None,  # Not directly available in daily view
-                    last_date=None,
-                    latitude=feature["geometry"]["coordinates"][1],
-                    longitude=feature["geometry"]["coordinates"][0],
-                )
+    response.raise_for_status()
+    data = response.json()
+
+    for feature in data.get("features", []):
+        props = feature["properties"]
+        cid = props.get("CLIMATE_IDENTIFIER")
+        if cid and cid not in stations_map:
+            stations_map[cid] = Station(
+                climate_id=cid,
+                # Fallback to cid if name missing
+                name=props.get("STATION_NAME", cid),
+                province=props.get("ENG_PROV_NAME", ""),
+                province_code=props.get("PROV_STATE_TERR_CODE", ""),
+                first_date=None,  # Not directly available in daily view
+                last_date=None,
+                latitude=feature["geometry"]["coordinates"][1],
+                longitude=feature["geometry"]["coordinates"][0],
+            )
 
     return sorted(stations_map.values(), key=lambda s: s.name)
 
 
+def _parse_daily(
+    feature: dict[str, Any],
+) -> tuple[str, float | None, float | None, float | None] | None:
+    """Extract (date, mean, min, max) from a climate-daily feature."""
+    props = feature["properties"]
+    mean = props.get("MEAN_TEMPERATURE")
+    low = props.get("MIN_TEMPERATURE")
+    high = props.get("MAX_TEMPERATURE")
+    # Skip if no temperature data at all
+    if mean is None and low is None and high is None:
+        return None
+
+    return props["LOCAL_DATE"][:10], mean, low, high  # YYYY-MM-DD
+
+
 def fetch_daily_data(
     climate_id: str, start_date: str, end_date: str
-) -> list[DailyObservation]:
+) -> DailyObservations:
     """Fetch daily climate observations for a station and date range."""
     # Ensure start_date is before end_date
     if start_date > end_date:
-        ipc_helpers.log(
+        protocol.log(
             "warn",
             f"Dates were backwards: {start_date} -> {end_date}. Swapping.",
         )
         start_date, end_date = end_date, start_date
 
-    url = f"{BASE_URL}/collections/climate-daily/items"
-    observations: list[DailyObservation] = []
-    offset = 0
-
-    with httpx.Client(timeout=60.0) as client:
-        while True:
-            params: dict[str, Any] = {
-                "f": "json",
-                "CLIMATE_IDENTIFIER": climate_id,
-                "datetime": f"{start_date}/{end_date}",
-                "limit": MAX_LIMIT,
-                "offset": offset,
-                "sortby": "LOCAL_DATE",
-            }
-
-            ipc_helpers.log("debug", f"OGC API Request: {url} params={params}")
-            response = client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            features = data.get("features", [])
-            if not features:
-                break
-
-            for feature in features:
-                props = feature["properties"]
-                # Skip if no temperature data at all
-                if (
-                    props.get("MEAN_TEMPERATURE") is None
-                    and props.get("MIN_TEMPERATURE") is None
-                    and props.get("MAX_TEMPERATURE") is None
-                ):
-                    continue
-
-                observations.append(
-                    DailyObservation(
-                        date=props["LOCAL_DATE"].split()[0],  # Get YYYY-MM-DD
-                        mean_temp=props.get("MEAN_TEMPERATURE"),
-                        min_temp=props.get("MIN_TEMPERATURE"),
-                        max_temp=props.get("MAX_TEMPERATURE"),
-                    )
-                )
-
-            # Check if we need to paginate
-            matched = data.get("numberMatched", 0)
-            returned = data.get("numberReturned", 0)
-            offset += returned
-
-            if offset >= matched or returned == 0:
-                break
-
-    return observations
+    params: dict[str, Any] = {
+        "f": "json",
+        "CLIMATE_IDENTIFIER": climate_id,
+        "datetime": f"{start_date}/{end_date}",
+        "sortby": "LOCAL_DATE",
+        # Only ship the columns we read; geometry is the station location,
+        # identical on every row
+        "properties": ",".join(DAILY_PROPERTIES),
+        "skipGeometry": "true",
+    }
+    rows = _loop.run_until_complete(
+        _fetch_all_pages(
+            "climate-daily", params, timeout=60.0, parse_feature=_parse_daily
+        )
+    )
+    dates, mean_temps, min_temps, max_temps = (
+        zip(*rows, strict=True) if rows else ((),) * 4
+    )
+
+    # None converts to NaN in a float64 array
+    return DailyObservations(
+        dates=np.array(dates, dtype="datetime64[D]"),
+        mean_temp=np.array(mean_temps, dtype=np.float64),
+        min_temp=np.array(min_temps, dtype=np.float64),
+        max_temp=np.array(max_temps, dtype=np.float64),
+    )
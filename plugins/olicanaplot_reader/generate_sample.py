@@ -1,5 +1,12 @@
-import math
-import random
+import numpy as np
+
+rng = np.random.default_rng()
+
+
+def format_rows(fmt, *columns):
+    """Format equal-length NumPy columns into CSV lines."""
+    return [fmt % row for row in zip(*(c.tolist() for c in columns))]
+
 
 yaml_header = """version: 1
 
@@ -81,57 +88,47 @@ axes:
         line_width: 8.0
 """
 
+# The header is static, so encode it once up front
+YAML_HEADER_BYTES = yaml_header.encode("utf-8")
+
 # Generate data for block 1 (RPM and Torque)
 num_points = 101
 t_start, t_end = 0, 10
-t_vals = [t_start + (t_end - t_start) * i / (num_points - 1) for i in range(num_points)]
+t_vals = np.linspace(t_start, t_end, num_points)
 
 # Block 1 CSV
-csv1 = []
-for t in t_vals:
-    rpm = 800 + 400 * math.sin(0.5 * t) + 10 * random.uniform(-1, 1)
-    torque = 100 + 20 * math.cos(0.5 * t) + 2 * random.uniform(-1, 1)
-    csv1.append(f"{t:.3f},{rpm:.1f},{torque:.1f}")
+rpm = 800 + 400 * np.sin(0.5 * t_vals) + 10 * rng.uniform(-1, 1, num_points)
+torque = 100 + 20 * np.cos(0.5 * t_vals) + 2 * rng.uniform(-1, 1, num_points)
+csv1 = format_rows("%.3f,%.1f,%.1f", t_vals, rpm, torque)
 
 # Block 2 CSV
-csv2 = []
-for t in t_vals:
-    temp = 90 + 5 * math.sin(0.1 * t) + 0.1 * random.uniform(-1, 1)
-    csv2.append(f"{t:.3f},{temp:.2f}")
+temp = 90 + 5 * np.sin(0.1 * t_vals) + 0.1 * rng.uniform(-1, 1, num_points)
+csv2 = format_rows("%.3f,%.2f", t_vals, temp)
 
 # Block 3 CSV (Line Types Demo)
-csv3 = []
-for t in t_vals:
-    y1 = math.sin(t)
-    y2 = math.cos(t)
-    y3 = math.sin(t * 0.5)
-    csv3.append(f"{t:.3f},{y1:.3f},{y2:.3f},{y3:.3f}")
+csv3 = format_rows(
+    "%.3f,%.3f,%.3f,%.3f",
+    t_vals,
+    np.sin(t_vals),
+    np.cos(t_vals),
+    np.sin(t_vals * 0.5),
+)
 
 # Block 4 CSV (Line Widths Demo)
-csv4 = []
-for t in t_vals:
-    y1 = math.sin(t * 1.5)
-    y2 = math.cos(t * 1.5)
-    y3 = math.sin(t * 0.75)
-    csv4.append(f"{t:.3f},{y1:.3f},{y2:.3f},{y3:.3f}")
-
-# Combine with form feeds (\x0c)
-output = (
-    yaml_header
-    + "\f\n"
-    + "\n".join(csv1)
-    + "\n\f\n"
-    + "\n".join(csv2)
-    + "\n\f\n"
-    + "\n".join(csv3)
-    + "\n\f\n"
-    + "\n".join(csv4)
-    + "\n"
+csv4 = format_rows(
+    "%.3f,%.3f,%.3f,%.3f",
+    t_vals,
+    np.sin(t_vals * 1.5),
+    np.cos(t_vals * 1.5),
+    np.sin(t_vals * 0.75),
 )
 
-# Write to file
+# Combine with form feeds (\x0c); binary mode skips newline translation
 file_path = "test_data.olicanaplot"
-with open(file_path, "w", encoding="utf-8") as f:
-    f.write(output)
+with open(file_path, "wb", buffering=1 << 20) as f:
+    f.write(YAML_HEADER_BYTES)
+    for block in (csv1, csv2, csv3, csv4):
+        f.write(b"\f\n")
+        f.write(("\n".join(block) + "\n").encode("utf-8"))
 
 print(f"Generated {file_path}")
@@ -1,6 +1,12 @@
-import datetime
-import math
-import random
+import numpy as np
+
+rng = np.random.default_rng()
+
+
+def format_rows(fmt, *columns):
+    """Format equal-length NumPy columns into CSV lines."""
+    return [fmt % row for row in zip(*(c.tolist() for c in columns))]
+
 
 yaml_header = """version: 1
 
@@ -76,49 +82,42 @@ axes:
         line_width: 8.0
 """
 
+# The header is static, so encode it once up front
+YAML_HEADER_BYTES = yaml_header.encode("utf-8")
+
 num_points = 50
-start_time = datetime.datetime(2026, 1, 1, 12, 0, 0)
-time_step = datetime.timedelta(hours=1)
+start_time = np.datetime64("2026-01-01T12:00:00", "s")
+time_step = np.timedelta64(1, "h")
+times = start_time + np.arange(num_points) * time_step
+iso_times = np.datetime_as_string(times, unit="s")  # YYYY-MM-DDTHH:MM:SS
+i_vals = np.arange(num_points)
 
 # Block 1 CSV: ISO8601 Base (Z)
-csv1 = []
-for i in range(num_points):
-    t_obj = start_time + i * time_step
-    t_str = t_obj.strftime("%Y-%m-%dT%H:%M:%SZ")
-    val1 = 100 + 40 * math.sin(i * 0.2) + random.uniform(-2, 2)
-    csv1.append(f"{t_str},{val1:.1f}")
+t_str = np.char.add(iso_times, "Z")
+val1 = 100 + 40 * np.sin(i_vals * 0.2) + rng.uniform(-2, 2, num_points)
+csv1 = format_rows("%s,%.1f", t_str, val1)
 
 # Block 2 CSV: ISO8601 Basic (Compact)
-csv2 = []
-for i in range(num_points):
-    t_obj = start_time + i * time_step
-    t_str = t_obj.strftime("%Y%m%d%H%M%S.000")
-    val1 = 100 + 40 * math.cos(i * 0.2) + random.uniform(-2, 2)
-    csv2.append(f"{t_str},{val1:.1f}")
-
-# Block 3 CSV: Unix Epoch
-csv3 = []
-for i in range(num_points):
-    t_obj = start_time + i * time_step
-    t_unix = t_obj.timestamp()
-    val1 = math.sin(i * 0.1)
-    val2 = math.sin(i * 0.1)
-    val3 = math.sin(i * 0.1)
-    csv3.append(f"{t_unix:.3f},{val1:.3f},{val2:.3f},{val3:.3f}")
-
-output = (
-    yaml_header
-    + "\f\n"
-    + "\n".join(csv1)
-    + "\n\f\n"
-    + "\n".join(csv2)
-    + "\n\f\n"
-    + "\n".join(csv3)
-    + "\n"
+t_str = np.char.add(
+    np.char.replace(
+        np.char.replace(np.char.replace(iso_times, "-", ""), ":", ""), "T", ""
+    ),
+    ".000",
 )
+val1 = 100 + 40 * np.cos(i_vals * 0.2) + rng.uniform(-2, 2, num_points)
+csv2 = format_rows("%s,%.1f", t_str, val1)
+
+# Block 3 CSV: Unix Epoch (times are UTC, matching the "Z" blocks above)
+t_unix = times.astype(np.int64).astype(np.float64)
+val1 = np.sin(i_vals * 0.1)
+csv3 = format_rows("%.3f,%.3f,%.3f,%.3f", t_unix, val1, val1, val1)
 
+# Combine with form feeds (\x0c); binary mode skips newline translation
 file_path = "test_date_data.olicanaplot"
-with open(file_path, "w", encoding="utf-8") as f:
-    f.write(output)
+with open(file_path, "wb", buffering=1 << 20) as f:
+    f.write(YAML_HEADER_BYTES)
+    for block in (csv1, csv2, csv3):
+        f.write(b"\f\n")
+        f.write(("\n".join(block) + "\n").encode("utf-8"))
 
 print(f"Generated {file_path}")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import datetime
+import itertools
 import sqlite3
 from typing import Any, Final
 
@@ -12,25 +13,86 @@ CACHE_DB: Final[str] = "open_meteo_cache.sq3"
 
 DAILY_SCHEMA: Final[dict[str, Any]] = {
     "city_name": pl.String,
-    "date": pl.String,
-    "year": pl.Int64,
-    "month": pl.Int64,
-    "day": pl.Int64,
+    "date": pl.Date,
     "tmean": pl.Float64,
     "tmin": pl.Float64,
     "tmax": pl.Float64,
 }
 
+# Hot statements, kept as fixed strings so sqlite3's per-connection
+# statement cache prepares each of them only once.
+_CITY_ID_SQL: Final[str] = "SELECT id FROM cities WHERE name = ?"
+_UPSERT_CITY_SQL: Final[str] = """
+    INSERT INTO cities (name, lat, lng)
+    VALUES (?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        lat=excluded.lat,
+        lng=excluded.lng
+"""
+_FIRST_DATE_SQL: Final[str] = (
+    "SELECT date FROM daily_data WHERE city_id = ? ORDER BY date ASC LIMIT 1"
+)
+_LAST_DATE_SQL: Final[str] = (
+    "SELECT date FROM daily_data WHERE city_id = ? ORDER BY date DESC LIMIT 1"
+)
+_DAILY_RANGE_SQL: Final[str] = """
+    SELECT date, tmean, tmin, tmax
+    FROM daily_data
+    WHERE city_id = ? AND date BETWEEN ? AND ?
+    ORDER BY date
+"""
+_UPSERT_DAILY_TEMPLATE: Final[str] = """
+    INSERT INTO daily_data
+    (city_id, date, tmean, tmin, tmax)
+    VALUES {values}
+    ON CONFLICT(city_id, date) DO UPDATE SET
+        tmean=excluded.tmean,
+        tmin=excluded.tmin,
+        tmax=excluded.tmax
+"""
+_UPSERT_DAILY_SQL: Final[str] = _UPSERT_DAILY_TEMPLATE.format(
+    values="(?, ?, ?, ?, ?)"
+)
+# Rows per multi-row upsert; 64 x 5 parameters stays well under SQLite's
+# default 999 bound-variable limit.
+_DAILY_CHUNK_ROWS: Final[int] = 64
+_UPSERT_DAILY_CHUNK_SQL: Final[str] = _UPSERT_DAILY_TEMPLATE.format(
+    values=",".join(["(?, ?, ?, ?, ?)"] * _DAILY_CHUNK_ROWS)
+)
+
+
+def _iso_to_int(date: str) -> int:
+    """Convert a YYYY-MM-DD string to its YYYYMMDD integer key."""
+    return int(date[0:4]) * 10000 + int(date[5:7]) * 100 + int(date[8:10])
+
 
 class ClimateCache:
     """Manages SQLite caching for daily climate data."""
 
     def __init__(self, db_path: str = CACHE_DB) -> None:
         self.db_path = db_path
+        # Autocommit: writes that need a transaction open one explicitly
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
         self._init_db()
 
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def __del__(self) -> None:
+        # __init__ may have failed before the connection was opened
+        if hasattr(self, "conn"):
+            self.close()
+
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        conn = self.conn
+        # WAL with synchronous=NORMAL only syncs at checkpoints; losing the
+        # last few writes on power loss is fine for a re-fetchable cache.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        with conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS cities (
@@ -56,141 +118,127 @@ class ClimateCache:
 
     def save_city(self, name: str, lat: float, lng: float) -> int:
         """Save a city and return its internal ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO cities (name, lat, lng)
-                VALUES (?, ?, ?)
-                ON CONFLICT(name) DO UPDATE SET
-                    lat=excluded.lat,
-                    lng=excluded.lng
-                """,
-                (name, lat, lng),
-            )
-            cursor = conn.cursor()
-            cursor.execute("SELECT id FROM cities WHERE name = ?", (name,))
-            return cursor.fetchone()[0]
-
-    def _get_city_id(self, conn: sqlite3.Connection, name: str) -> int | None:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM cities WHERE name = ?", (name,))
-        row = cursor.fetchone()
+        self.conn.execute(_UPSERT_CITY_SQL, (name, lat, lng))
+        return self._get_city_id(name)
+
+    def _get_city_id(self, name: str) -> int | None:
+        row = self.conn.execute(_CITY_ID_SQL, (name,)).fetchone()
         return row[0] if row else None
 
-    def get_city_location(self, name: str) -> tuple[float, float] | None:
-        """Get the cached coordinates of a city."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT lat, lng FROM cities WHERE name = ?", (name,))
-            row = cursor.fetchone()
-            return (row[0], row[1]) if row else None
+    def get_city_locations(
+        self, names: list[str]
+    ) -> dict[str, tuple[float, float]]:
+        """Get the cached coordinates of several cities in one query."""
+        if not names:
+            return {}
+        placeholders = ",".join("?" * len(names))
+        sql = f"SELECT name, lat, lng FROM cities WHERE name IN ({placeholders})"
+        rows = self.conn.execute(sql, names).fetchall()
+        return {name: (lat, lng) for name, lat, lng in rows}
 
     def has_date_range(
         self, city_name: str, start_date: str, end_date: str
     ) -> bool:
         """Check if we have the fully required date range for a city."""
-        with sqlite3.connect(self.db_path) as conn:
-            cid = self._get_city_id(conn, city_name)
-            if cid is None:
-                return False
-
-            start_int = int(start_date.replace("-", ""))
-            end_int = int(end_date.replace("-", ""))
-
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT MIN(date), MAX(date) FROM daily_data WHERE city_id = ?",
-                (cid,),
-            )
-            row = cursor.fetchone()
-            if not row or not row[0] or not row[1]:
-                return False
+        start_int = _iso_to_int(start_date)
+        end_int = _iso_to_int(end_date)
+
+        cid = self._get_city_id(city_name)
+        if cid is None:
+            return False
+
+        # MIN and MAX together force a scan of the city's rows; ordered
+        # LIMIT 1 queries are single seeks on the (city_id, date) key
+        first = self.conn.execute(_FIRST_DATE_SQL, (cid,)).fetchone()
+        if not first or first[0] > start_int:
+            return False
 
-            # Since Open-Meteo data lags
-            today = datetime.date.today()
-            lag_date = today - datetime.timedelta(days=7)
-            lag_int = lag_date.year * 10000 + lag_date.month * 100 + lag_date.day
+        last = self.conn.execute(_LAST_DATE_SQL, (cid,)).fetchone()
 
-            target_end_date = min(end_int, lag_int)
+        # Since Open-Meteo data lags
+        today = datetime.date.today()
+        lag_date = today - datetime.timedelta(days=7)
+        lag_int = lag_date.year * 10000 + lag_date.month * 100 + lag_date.day
 
-            return row[0] <= start_int and row[1] >= target_end_date
+        target_end_date = min(end_int, lag_int)
+
+        return last[0] >= target_end_date
 
     def get_daily_data(
         self, city_name: str, start_date: str, end_date: str
     ) -> pl.DataFrame:
         """Retrieve cached daily records for a city."""
-        with sqlite3.connect(self.db_path) as conn:
-            cid = self._get_city_id(conn, city_name)
-            if cid is None:
-                return pl.DataFrame(schema=DAILY_SCHEMA)
-
-            start_int = int(start_date.replace("-", ""))
-            end_int = int(end_date.replace("-", ""))
-
-            query = """
-                SELECT date, tmean, tmin, tmax
-                FROM daily_data
-                WHERE city_id = ? AND date BETWEEN ? AND ?
-            """
-            cursor = conn.cursor()
-            cursor.execute(query, (cid, start_int, end_int))
-            rows = cursor.fetchall()
-
-            if not rows:
-                return pl.DataFrame(schema=DAILY_SCHEMA)
-
-            data = []
-            for r in rows:
-                d_int = r[0]
-                s = str(d_int)
-                y, m, d = int(s[:4]), int(s[4:6]), int(s[6:])
-                d_str = f"{y:04d}-{m:02d}-{d:02d}"
-                data.append(
-                    {
-                        "city_name": city_name,
-                        "date": d_str,
-                        "year": y,
-                        "month": m,
-                        "day": d,
-                        "tmean": r[1],
-                        "tmin": r[2],
-                        "tmax": r[3],
-                    }
-                )
-            df = pl.from_dicts(data, schema=DAILY_SCHEMA)
-            return df.sort("date")
+        start_int = _iso_to_int(start_date)
+        end_int = _iso_to_int(end_date)
+
+        cid = self._get_city_id(city_name)
+        if cid is None:
+            return pl.DataFrame(schema=DAILY_SCHEMA)
+
+        rows = self.conn.execute(
+            _DAILY_RANGE_SQL, (cid, start_int, end_int)
+        ).fetchall()
+
+        if not rows:
+            return pl.DataFrame(schema=DAILY_SCHEMA)
+
+        # Build columns directly and turn YYYYMMDD into dates in Polars
+        d_ints, tmean, tmin, tmax = zip(*rows, strict=True)
+        d_int = pl.col("d_int")
+        return (
+            pl.DataFrame(
+                {"d_int": d_ints, "tmean": tmean, "tmin": tmin, "tmax": tmax},
+                schema={
+                    "d_int": pl.Int64,
+                    "tmean": pl.Float64,
+                    "tmin": pl.Float64,
+                    "tmax": pl.Float64,
+                },
+            )
+            .select(
+                city_name=pl.lit(city_name),
+                date=pl.date(d_int // 10000, d_int // 100 % 100, d_int % 100),
+                tmean="tmean",
+                tmin="tmin",
+                tmax="tmax",
+            )
+            .cast(DAILY_SCHEMA)
+        )
 
     def save_daily(self, city_name: str, df: pl.DataFrame) -> None:
         """Save a polars DataFrame to the daily data cache."""
         if df.is_empty():
             return
 
-        with sqlite3.connect(self.db_path) as conn:
-            cid = self._get_city_id(conn, city_name)
-            if cid is None:
-                return
-
-            rows_to_insert = []
-            for row in df.iter_rows(named=True):
-                # parse YYYY-MM-DD
-                d_str = row["date"].replace("-", "")
-                if len(d_str) != 8:
-                    continue
-                d_int = int(d_str)
-
-                rows_to_insert.append(
-                    (cid, d_int, row["tmean"], row["tmin"], row["tmax"])
-                )
+        cid = self._get_city_id(city_name)
+        if cid is None:
+            return
 
-            conn.executemany(
-                """
-                INSERT INTO daily_data
-                (city_id, date, tmean, tmin, tmax)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(city_id, date) DO UPDATE SET
-                    tmean=excluded.tmean,
-                    tmin=excluded.tmin,
-                    tmax=excluded.tmax
-                """,
-                rows_to_insert,
-            )
+        # Date -> YYYYMMDD in one columnar pass, then straight to
+        # parameter tuples
+        date = pl.col("date")
+        rows_to_insert = df.select(
+            pl.lit(cid),
+            date.dt.year().cast(pl.Int32) * 10000
+            + date.dt.month().cast(pl.Int32) * 100
+            + date.dt.day().cast(pl.Int32),
+            "tmean",
+            "tmin",
+            "tmax",
+        ).rows()
+
+        # Whole chunks go through the multi-row statement, which runs the
+        # VM once per 64 rows; the remainder uses the single-row upsert
+        n_chunked = len(rows_to_insert) - len(rows_to_insert) % _DAILY_CHUNK_ROWS
+
+        # One explicit transaction for the whole batch instead of
+        # committing (and syncing) per statement
+        with self.conn as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for i in range(0, n_chunked, _DAILY_CHUNK_ROWS):
+                chunk = rows_to_insert[i : i + _DAILY_CHUNK_ROWS]
+                conn.execute(
+                    _UPSERT_DAILY_CHUNK_SQL,
+                    tuple(itertools.chain.from_iterable(chunk)),
+                )
+            conn.executemany(_UPSERT_DAILY_SQL, rows_to_insert[n_chunked:])
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-import json
 import os
 from typing import Any
 
+import orjson
+
 HISTORY_FILE = "search_history.json"
+MAX_HISTORY = 15
 
 
 def get_past_searches() -> list[dict[str, Any]]:
@@ -14,8 +16,8 @@ def get_past_searches() -> list[dict[str, Any]]:
     if not os.path.exists(HISTORY_FILE):
         return []
     try:
-        with open(HISTORY_FILE, "r") as f:
-            data = json.load(f)
+        with open(HISTORY_FILE, "rb") as f:
+            data = orjson.loads(f.read())
             if isinstance(data, list):
                 return data
     except Exception:
@@ -33,23 +35,24 @@ def log_search(cities: list[str], start_date: str, end_date: str) -> None:
         "end_date": end_date,
     }
 
-    # Filter out exact duplicate to move it to top
-    filtered = []
-    for h in history:
-        if (
-            h.get("cities") == cities
-            and h.get("start_date") == start_date
-            and h.get("end_date") == end_date
-        ):
-            continue
-        filtered.append(h)
-
-    filtered.insert(0, new_entry)
-    # Keep last 15
-    filtered = filtered[:15]
-
+    # Key entries by their search so an exact duplicate collapses into the
+    # new entry at the top; dicts keep first-insertion order
+    seen: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for h in [new_entry, *history]:
+        key = (
+            tuple(h.get("cities", ())),
+            h.get("start_date"),
+            h.get("end_date"),
+        )
+        seen.setdefault(key, h)
+    filtered = list(seen.values())[:MAX_HISTORY]
+
+    # Write a sibling temp file and swap it in, so a crash mid-write never
+    # leaves a truncated history behind
+    tmp_file = HISTORY_FILE + ".tmp"
     try:
-        with open(HISTORY_FILE, "w") as f:
-            json.dump(filtered, f, indent=2)
+        with open(tmp_file, "wb") as f:
+            f.write(orjson.dumps(filtered))
+        os.replace(tmp_file, HISTORY_FILE)
     except Exception:
         pass
@@ -1,6 +1,7 @@
 import datetime
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -16,8 +17,10 @@ if sdk_path not in sys.path:
 import protocol  # noqa: E402
 
 import history  # noqa: E402
-from cache import ClimateCache  # noqa: E402
-from open_meteo import fetch_historical, geocode_city  # noqa: E402
+from cache import DAILY_SCHEMA, ClimateCache  # noqa: E402
+from open_meteo import fetch_historical_bulk, geocode_city  # noqa: E402
+
+TEMPERATURES = ["tmean", "tmin", "tmax"]
 
 
 @dataclass
@@ -29,6 +32,9 @@ class PluginState:
     end_date: str = ""
     mode: str = "Daily"
     data: dict[str, pl.DataFrame] = field(default_factory=dict)
+    # Aggregated frames keyed by (city, mode), shared by the three series
+    # of a city; cleared whenever data is reloaded
+    derived: dict[tuple[str, str], pl.DataFrame] = field(default_factory=dict)
 
 
 state = PluginState()
@@ -38,15 +44,13 @@ cache = ClimateCache()
 def get_history_options() -> tuple[list[str], dict[str, dict[str, Any]]]:
     """Retrieve history options formatted for UI dropdown."""
     past_searches = history.get_past_searches()
-    options = ["New Search"]
-    search_maps = {}
+    # Keyed by label, so the first occurrence wins without rescanning
+    search_maps: dict[str, dict[str, Any]] = {}
     for s in past_searches:
         c_str = ", ".join(s["cities"])
         label = f"{c_str} ({s['start_date']} to {s['end_date']})"
-        if label not in options:
-            options.append(label)
-            search_maps[label] = s
-    return options, search_maps
+        search_maps.setdefault(label, s)
+    return ["New Search", *search_maps], search_maps
 
 
 def build_schema(
@@ -140,11 +144,10 @@ def geocode_city_list(cities: list[str]) -> tuple[list[dict[str, Any]], bool]:
     """Geocode a string list of cities into a list of map markers."""
     markers = []
     all_success = True
+    cities = [c.strip() for c in cities if c.strip()]
+    cached = cache.get_city_locations(cities)
     for city in cities:
-        city = city.strip()
-        if not city:
-            continue
-        loc = cache.get_city_location(city)
+        loc = cached.get(city)
         if not loc:
             loc = geocode_city(city)
             if loc:
@@ -156,37 +159,57 @@ def geocode_city_list(cities: list[str]) -> tuple[list[dict[str, Any]], bool]:
     return markers, all_success
 
 
-def load_city_data(city: str, start_date: str, end_date: str) -> bool:
-    """Load climate data for a single city from cache or remote API."""
-    if cache.has_date_range(city, start_date, end_date):
-        protocol.log("info", f"Using cached data for {city}")
-        state.data[city] = cache.get_daily_data(city, start_date, end_date)
-        return True
+def load_cities_data(
+    cities: list[str], start_date: str, end_date: str
+) -> str | None:
+    """Load climate data for cities from cache or one bulk API request.
 
-    protocol.log("info", f"Geocoding {city}...")
-    loc = cache.get_city_location(city)
-    if not loc:
-        loc = geocode_city(city)
-        if loc:
-            cache.save_city(city, loc[0], loc[1])
-
-    if not loc:
-        protocol.send_error(f"Could not calculate coordinates for {city}")
-        return False
+    Returns an error message on failure, or None on success.
+    """
+    to_fetch = []
+    for city in cities:
+        if cache.has_date_range(city, start_date, end_date):
+            protocol.log("info", f"Using cached data for {city}")
+            state.data[city] = cache.get_daily_data(city, start_date, end_date)
+        else:
+            to_fetch.append(city)
+
+    if not to_fetch:
+        return None
+
+    locations = cache.get_city_locations(to_fetch)
+    missing = [city for city in to_fetch if city not in locations]
+    if missing:
+        protocol.log("info", f"Geocoding {', '.join(missing)}...")
+        # Geocoding is one blocking request per name, so run them together
+        with ThreadPoolExecutor(max_workers=min(8, len(missing))) as ex:
+            for city, loc in zip(
+                missing, ex.map(geocode_city, missing), strict=True
+            ):
+                if not loc:
+                    return f"Could not calculate coordinates for {city}"
+                cache.save_city(city, loc[0], loc[1])
+                locations[city] = loc
 
-    lat, lng = loc
-    protocol.log("info", f"Fetching open-meteo for {city}...")
+    protocol.log("info", f"Fetching open-meteo for {', '.join(to_fetch)}...")
     try:
-        df_new = fetch_historical(lat, lng, start_date, end_date)
-        if not df_new.is_empty():
+        frames = fetch_historical_bulk(
+            [locations[city] for city in to_fetch], start_date, end_date
+        )
+        for city, df_new in zip(to_fetch, frames, strict=True):
+            if df_new.is_empty():
+                protocol.log("warn", f"No data returned for {city}")
+                continue
+            # The fetch spans the whole requested range, so keep the frame
+            # rather than reading it back out of the cache; shape it like
+            # get_daily_data so cache hits and misses look the same
             cache.save_daily(city, df_new)
-            state.data[city] = cache.get_daily_data(city, start_date, end_date)
-        else:
-            protocol.log("warn", f"No data returned for {city}")
-        return True
+            state.data[city] = df_new.select(
+                pl.lit(city).alias("city_name"), pl.all()
+            ).cast(DAILY_SCHEMA)
+        return None
     except Exception as e:
-        protocol.send_error(f"Failed fetching {city}: {e}")
-        return False
+        return f"Failed fetching {', '.join(to_fetch)}: {e}"
 
 
 def process_form_change(
@@ -248,9 +271,11 @@ def process_form_submit(
         return False
 
     protocol.log("info", f"Processing: {', '.join(cities)}")
-    for city in cities:
-        if not load_city_data(city, start_date, end_date):
-            return False
+    state.derived.clear()
+    error = load_cities_data(cities, start_date, end_date)
+    if error:
+        protocol.send_error(error)
+        return False
 
     history.log_search(cities, start_date, end_date)
     state.cities = cities
@@ -367,6 +392,41 @@ def handle_get_series_config() -> None:
     protocol.send_response({"result": series})
 
 
+def aggregate_daily(lf: pl.LazyFrame, mode: str) -> pl.LazyFrame:
+    """Reduce daily rows to the plot mode, for all temperatures at once."""
+    means = pl.col(TEMPERATURES).mean()
+    if mode in ["Daily Means", "Daily Means (smoothed)"]:
+        lf = (
+            lf.group_by(
+                month=pl.col("date").dt.month(), day=pl.col("date").dt.day()
+            )
+            .agg(means)
+            .with_columns(date=pl.date(2000, "month", "day"))
+            .sort("date")
+        )
+        if mode == "Daily Means (smoothed)":
+            lf = lf.with_columns(
+                pl.col(TEMPERATURES).rolling_mean(window_size=10, center=True)
+            )
+    elif mode == "Monthly Means":
+        lf = (
+            lf.group_by(month=pl.col("date").dt.month())
+            .agg(means)
+            .with_columns(date=pl.date(2000, "month", 15))
+            .sort("date")
+        )
+    elif mode == "Monthly":
+        lf = (
+            lf.group_by(
+                year=pl.col("date").dt.year(), month=pl.col("date").dt.month()
+            )
+            .agg(means)
+            .with_columns(date=pl.date("year", "month", 15))
+            .sort("date")
+        )
+    return lf.select("date", *TEMPERATURES)
+
+
 def handle_get_series_data(series_id: str, preferred_storage: str) -> None:
     """Format and send float vectors containing timeseries outputs."""
     if not state.data:
@@ -382,66 +442,33 @@ def handle_get_series_data(series_id: str, preferred_storage: str) -> None:
     var_name = parts[-1]
 
     df = state.data.get(city)
-    if df is None or var_name not in ["tmean", "tmin", "tmax"]:
+    if df is None or var_name not in TEMPERATURES:
         protocol.send_error("Series or city not found")
         return
 
-    df = df.select(["date", var_name]).drop_nulls()
-
-    if state.mode in ["Daily Means", "Daily Means (smoothed)"]:
-        df = (
-            df.with_columns(pl.col("date").str.slice(5).alias("md"))
-            .group_by("md")
-            .agg(pl.col(var_name).mean())
-            .with_columns(
-                pl.concat_str([pl.lit("2000-"), pl.col("md")]).alias("date")
-            )
-            .sort("date")
-        )
-        if state.mode == "Daily Means (smoothed)":
-            df = df.with_columns(
-                pl.col(var_name)
-                .rolling_mean(window_size=10, center=True)
-                .alias(var_name)
-            ).drop_nulls()
-    elif state.mode == "Monthly Means":
-        df = (
-            df.with_columns(pl.col("date").str.slice(5, 2).alias("month"))
-            .group_by("month")
-            .agg(pl.col(var_name).mean())
-            .with_columns(
-                pl.concat_str(
-                    [pl.lit("2000-"), pl.col("month"), pl.lit("-15")]
-                ).alias("date")
-            )
-            .sort("date")
-        )
-    elif state.mode == "Monthly":
-        df = (
-            df.with_columns(pl.col("date").str.slice(0, 7).alias("ym"))
-            .group_by("ym")
-            .agg(pl.col(var_name).mean())
-            .with_columns(
-                pl.concat_str([pl.col("ym"), pl.lit("-15")]).alias("date")
-            )
-            .sort("date")
-        )
-
-    values: list[float] = []
-
-    for row in df.iter_rows(named=True):
-        try:
-            dt = datetime.datetime.strptime(row["date"], "%Y-%m-%d")
-            timestamp = dt.timestamp()
-            val = row[var_name]
-
-            if val is not None:
-                values.append(float(timestamp))
-                values.append(float(val))
-        except Exception:
-            continue
+    # The host requests tmean, tmin and tmax back to back, so aggregate all
+    # three once per city and mode and reuse the result
+    key = (city, state.mode)
+    derived = state.derived.get(key)
+    if derived is None:
+        derived = aggregate_daily(df.lazy(), state.mode).collect()
+        state.derived[key] = derived
+
+    # Dates become UTC-midnight epoch seconds and the timestamp/value
+    # pairs are interleaved as a single exploded column
+    interleaved = (
+        derived.lazy()
+        .select(ts=pl.col("date").dt.epoch("s"), val=pl.col(var_name))
+        .drop_nulls()
+        .select(pl.concat_list("ts", "val").cast(pl.List(pl.Float64)))
+        .collect()
+        .to_series()
+        .explode()
+    )
 
-    protocol.send_binary_data(values, "interleaved")
+    # to_numpy is a zero-copy view of the Float64 column, so the buffer goes
+    # to stdout without materializing Python floats
+    protocol.send_binary_data(interleaved.to_numpy(), "interleaved")
 
 
 def main() -> None:
@@ -1,46 +1,78 @@
 """Open Meteo API Client."""
 
 import datetime
+from functools import lru_cache
 
+import orjson
 import polars as pl
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+# One pooled session so repeated calls reuse keep-alive TCP/TLS connections
+# instead of handshaking per request; sized for the geocoding threads
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    ),
+)
 
+
+@lru_cache(maxsize=512)
 def geocode_city(name: str) -> tuple[float, float] | None:
-    """Geocode a city name using Open-Meteo Geocoding API."""
+    """Geocode a city name using Open-Meteo Geocoding API.
+
+    Results, including misses, are memoized for the life of the process:
+    the form re-geocodes its city list on every change while typing.
+    """
     url = "https://geocoding-api.open-meteo.com/v1/search"
     params = {"name": name, "count": 1, "language": "en", "format": "json"}
-    resp = requests.get(url, params=params, timeout=10)
+    resp = _session.get(url, params=params, timeout=10)
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
     if "results" in data and len(data["results"]) > 0:
         res = data["results"][0]
         return float(res["latitude"]), float(res["longitude"])
     return None
 
 
-def fetch_historical(
-    lat: float, lng: float, start_date: str, end_date: str
-) -> pl.DataFrame:
-    """Fetch historical daily data for a location."""
+def fetch_historical_bulk(
+    coords: list[tuple[float, float]], start_date: str, end_date: str
+) -> list[pl.DataFrame]:
+    """Fetch historical daily data for several locations in one request.
+
+    Returns one DataFrame per coordinate pair, in the same order.
+    """
     url = "https://archive-api.open-meteo.com/v1/archive"
 
     today_str = str(datetime.date.today())
     target_end_date = min(end_date, today_str)
 
     params = {
-        "latitude": lat,
-        "longitude": lng,
+        "latitude": ",".join(str(lat) for lat, _ in coords),
+        "longitude": ",".join(str(lng) for _, lng in coords),
         "start_date": start_date,
         "end_date": target_end_date,
         "daily": "temperature_2m_max,temperature_2m_min,temperature_2m_mean",
         "timezone": "auto",
     }
 
-    resp = requests.get(url, params=params, timeout=30)
+    resp = _session.get(url, params=params, timeout=30)
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
+
+    # A single location comes back as an object, several as a list
+    if isinstance(data, dict):
+        data = [data]
+
+    return [_parse_daily(location) for location in data]
+
 
+def _parse_daily(data: dict) -> pl.DataFrame:
     daily = data.get("daily", {})
     dates = daily.get("time", [])
     tmax = daily.get("temperature_2m_max", [])
@@ -50,6 +82,12 @@ def fetch_historical(
     if not dates or not tmax or not tmin or not tmean:
         return pl.DataFrame()
 
+    # Typed Series skip dtype inference and parse the dates as they're built
     return pl.DataFrame(
-        {"date": dates, "tmean": tmean, "tmin": tmin, "tmax": tmax}
+        [
+            pl.Series("date", dates, dtype=pl.String).str.to_date("%Y-%m-%d"),
+            pl.Series("tmean", tmean, dtype=pl.Float64),
+            pl.Series("tmin", tmin, dtype=pl.Float64),
+            pl.Series("tmax", tmax, dtype=pl.Float64),
+        ]
     )
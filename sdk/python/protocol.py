@@ -2,20 +2,50 @@
 
 from __future__ import annotations
 
+import array
 import json
 import os
-import struct
 import sys
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    pass
+    if sys.version_info >= (3, 12):
+        from collections.abc import Buffer
+    else:
+        from typing_extensions import Buffer
+
+# orjson is optional: plugins that install it get faster (de)serialization
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
+# struct format codes of a float64 buffer in native or little-endian order
+_NATIVE_FLOAT64 = ("d", "@d", "=d")
+_FLOAT64_FORMATS = (*_NATIVE_FLOAT64, "<d")
+
+# Debug log messages are only sent to the host when this is "debug"
+LOG_LEVEL = os.environ.get("OLICANAPLOT_LOG_LEVEL", "info").lower()
+
+# All output goes through sys.stdout.buffer; keep Windows from translating
+# newlines inside binary payloads.
+if os.name == "nt":
+    import msvcrt
+
+    msvcrt.setmode(sys.stdout.fileno(), os.O_BINARY)
 
 
 def send_response(data: dict[str, Any]) -> None:
     """Send a JSON response to the host."""
-    sys.stdout.write(json.dumps(data) + "\n")
-    sys.stdout.flush()
+    sys.stdout.buffer.write(_dumps(data) + b"\n")
+    sys.stdout.buffer.flush()
 
 
 def send_error(msg: str) -> None:
@@ -59,45 +89,62 @@ def send_form_update(
     send_response(resp)
 
 
-def send_binary_data(values: list[float], storage: str = "interleaved") -> None:
-    """Send binary float64 data following a JSON header."""
+def send_binary_data(
+    values: list[float] | Buffer, storage: str = "interleaved"
+) -> None:
+    """Send binary float64 data following a JSON header.
+
+    ``values`` may be a list of floats, an ``array.array("d")``, or any
+    other object exposing a contiguous float64 buffer (such as a NumPy
+    ``"<f8"`` array), which is written straight to stdout without
+    per-element packing. Buffers of any other item type raise TypeError,
+    since the host reads the payload as float64 regardless.
+    """
+    if isinstance(values, list):
+        values = array.array("d", values)
+    view = memoryview(values)
+    if view.format not in _FLOAT64_FORMATS:
+        raise TypeError(
+            f"binary data must be float64, got buffer format {view.format!r}"
+        )
+    if sys.byteorder == "big" and view.format in _NATIVE_FLOAT64:
+        # Native order is big-endian here; the wire format is little-endian
+        swapped = array.array("d")
+        swapped.frombytes(view.tobytes())
+        swapped.byteswap()
+        view = memoryview(swapped)
+    payload = view.cast("B")
+
     # JSON header
     header = {
         "type": "binary",
-        "length": len(values) * 8,  # bytes
+        "length": payload.nbytes,  # bytes
         "storage": storage,
     }
-    sys.stdout.write(json.dumps(header) + "\n")
-    sys.stdout.flush()
+    sys.stdout.buffer.write(_dumps(header) + b"\n")
 
     # Binary payload
-    if os.name == "nt":
-        import msvcrt
-
-        msvcrt.setmode(sys.stdout.fileno(), os.O_BINARY)
-
-    # '<' for little-endian, 'd' for float64
-    payload = struct.pack(f"<{len(values)}d", *values)
     sys.stdout.buffer.write(payload)
     sys.stdout.buffer.flush()
 
-    if os.name == "nt":
-        import msvcrt
-
-        msvcrt.setmode(sys.stdout.fileno(), os.O_TEXT)
-
 
 def log(level: str, message: str) -> None:
-    """Send an asynchronous log message to the host."""
+    """Send an asynchronous log message to the host.
+
+    Debug messages are dropped unless LOG_LEVEL is "debug".
+    """
+    if level == "debug" and LOG_LEVEL != "debug":
+        return
     send_response({"method": "log", "level": level, "message": message})
 
 
 def read_request() -> dict[str, Any] | None:
     """Read a JSON request from stdin."""
-    line = sys.stdin.readline()
+    # Read raw bytes; the decoder handles UTF-8 and the trailing newline
+    line = sys.stdin.buffer.readline()
     if not line:
         return None
     try:
-        return json.loads(line.strip())
-    except json.JSONDecodeError:
+        return _loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
         return None